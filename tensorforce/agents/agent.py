@@ -146,8 +146,8 @@ class Agent(Recorder):
                 (<span style="color:#C00000"><b>required</b></span>, unless saver is specified).
             filename (str): Checkpoint filename, with or without append and extension
                 (<span style="color:#00C000"><b>default</b></span>: "agent").
-            format ("checkpoint" | "saved-model" | "numpy" | "hdf5"): File format, "saved-model" loads
-                an act-only agent based on a Protobuf model
+            format ("checkpoint" | "saved-model" | "numpy" | "hdf5" | "raw"): File format,
+                "saved-model" loads an act-only agent based on a Protobuf model
                 (<span style="color:#00C000"><b>default</b></span>: format matching directory and
                 filename, required to be unambiguous).
             environment (Environment object): Environment which the agent is supposed to be trained
@@ -396,6 +396,12 @@ class Agent(Recorder):
                 auxiliary['mask'] = states.pop(name + '_mask', np.ones(
                     shape=(num_parallel,) + spec.shape + (spec.num_values,), dtype=spec.np_type()
                 ))
+                # At least one action has to be valid (checked here instead of in-graph)
+                if not np.asarray(auxiliary['mask']).any(axis=-1).all():
+                    raise TensorforceError.value(
+                        name='Agent.act', argument=(name + '_mask'), value=auxiliary['mask'],
+                        hint='no valid action'
+                    )
             return auxiliary
 
         auxiliaries = self.actions_spec.fmap(function=function, cls=ArrayDict, with_names=True)
@@ -501,7 +507,10 @@ class Agent(Recorder):
 
         return num_updates
 
-    def save(self, directory, filename=None, format='checkpoint', append=None):
+    def save(
+        self, directory, filename=None, format='checkpoint', append=None, asynchronous=False,
+        compression=None, dtype=None
+    ):
         """
         Saves the agent to a checkpoint.
 
@@ -510,14 +519,26 @@ class Agent(Recorder):
                 (<span style="color:#C00000"><b>required</b></span>).
             filename (str): Checkpoint filename, without extension
                 (<span style="color:#C00000"><b>required</b></span>, unless "saved-model" format).
-            format ("checkpoint" | "saved-model" | "numpy" | "hdf5"): File format, "checkpoint" uses
-                TensorFlow Checkpoint to save model, "saved-model" uses TensorFlow SavedModel to
-                save an optimized act-only model, whereas the others store only variables as
-                NumPy/HDF5 file
+            format ("checkpoint" | "saved-model" | "numpy" | "hdf5" | "raw"): File format,
+                "checkpoint" uses TensorFlow Checkpoint to save model, "saved-model" uses TensorFlow
+                SavedModel to save an optimized act-only model, whereas the others store only
+                variables as NumPy/HDF5 file or as flat binary file plus JSON index (".idx.json")
                 (<span style="color:#00C000"><b>default</b></span>: TensorFlow Checkpoint).
             append ("timesteps" | "episodes" | "updates"): Append timestep/episode/update to
                 checkpoint filename
                 (<span style="color:#00C000"><b>default</b></span>: none).
+            asynchronous (bool): Whether to write "numpy"/"hdf5"/"raw" files in a background
+                thread, after synchronously taking a snapshot of the variables, or "checkpoint"
+                files via TensorFlow's asynchronous checkpointing (TensorFlow >= 2.9, otherwise
+                synchronous), the next save/restore/close waits for the write to finish
+                (<span style="color:#00C000"><b>default</b></span>: false).
+            compression ("lzf" | "gzip"): Compression of larger variables for "hdf5" format, with
+                byte shuffling, "lzf" is considerably faster than "gzip" at a slightly lower ratio
+                (<span style="color:#00C000"><b>default</b></span>: no compression).
+            dtype ("float16"): Downcast float variables for "numpy"/"hdf5"/"raw" format, halving
+                file size at reduced precision, for instance for evaluation snapshots, restore
+                casts back to the variable type
+                (<span style="color:#00C000"><b>default</b></span>: variable type).
 
         Returns:
             str: Checkpoint path.
@@ -529,10 +550,21 @@ class Agent(Recorder):
         #     if self.buffer_indices[parallel] > 0:
         #         self.model_observe(parallel=parallel)
 
-        path = self.model.save(directory=directory, filename=filename, format=format, append=append)
-
         if filename is None:
             filename = self.model.name
+
+        # Append value from the Python-side counters, which act/observe/reset/restore keep in sync
+        # with the model, instead of a device read in Model.save
+        if append in ('timesteps', 'episodes', 'updates'):
+            model_filename = filename + '-' + str(getattr(self, append))
+            append = None
+        else:
+            model_filename = filename
+
+        path = self.model.save(
+            directory=directory, filename=model_filename, format=format, append=append,
+            asynchronous=asynchronous, compression=compression, dtype=dtype
+        )
         spec_path = os.path.join(directory, filename + '.json')
         try:
             with open(spec_path, 'w') as fp:
@@ -565,7 +597,7 @@ class Agent(Recorder):
             filename (str): Checkpoint filename, with or without append and extension
                 (<span style="color:#C00000"><b>required</b></span>, unless "saved-model" format and
                 saver specified).
-            format ("checkpoint" | "numpy" | "hdf5"): File format
+            format ("checkpoint" | "numpy" | "hdf5" | "raw"): File format
                 (<span style="color:#00C000"><b>default</b></span>: format matching directory and
                 filename, required to be unambiguous).
         """
@@ -589,6 +621,9 @@ class Agent(Recorder):
             elif filename.endswith('.h5'):
                 filename = filename[:-3]
                 format = 'hdf5'
+            elif filename.endswith('.bin'):
+                filename = filename[:-4]
+                format = 'raw'
             else:
                 assert False
         elif format is None and os.path.isfile(os.path.join(directory, filename + '.index')):
@@ -600,6 +635,8 @@ class Agent(Recorder):
             os.path.isfile(os.path.join(directory, filename + '.h5'))
         ):
             format = 'hdf5'
+        elif format is None and os.path.isfile(os.path.join(directory, filename + '.bin')):
+            format = 'raw'
 
         else:
             # infer format from directory
@@ -629,6 +666,17 @@ class Agent(Recorder):
                     n = int(name[len(filename) + 1: -5])
                     if n > latest:
                         latest = n
+                elif format in (None, 'raw') and name == filename + '.bin':
+                    assert found is None
+                    found = 'raw'
+                    latest = None
+                elif format in (None, 'raw') and name.startswith(filename) and \
+                        name.endswith('.bin'):
+                    assert found is None or found == 'raw'
+                    found = 'raw'
+                    n = int(name[len(filename) + 1: -4])
+                    if n > latest:
+                        latest = n
 
             if latest == -1:
                 if format is None:
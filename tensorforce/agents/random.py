@@ -82,16 +82,23 @@ class RandomAgent(Agent):
             can be masked via an optional "[ACTION-NAME]_mask" state input
             (<span style="color:#00C000"><b>default</b></span>: true).</li>
             <li><b>create_tf_assertions</b> (<i>bool</i>) &ndash; Whether to create internal
-            TensorFlow assertion operations
+            TensorFlow assertion operations, input assertions in act and observe additionally
+            require create_debug_assertions since input values are checked before being passed to
+            TensorFlow
             (<span style="color:#00C000"><b>default</b></span>: true).</li>
+            <li><b>jit_compile</b> (<i>bool</i>) &ndash; Whether to XLA-compile the act and observe
+            functions as well as normalization layers, requires create_tf_assertions to be false
+            and no reward summaries
+            (<span style="color:#00C000"><b>default</b></span>: false).</li>
             </ul>
         summarizer (specification): TensorBoard summarizer configuration with the following
             attributes (<span style="color:#00C000"><b>default</b></span>: no summarizer):
             <ul>
             <li><b>directory</b> (<i>path</i>) &ndash; summarizer directory
             (<span style="color:#C00000"><b>required</b></span>).</li>
-            <li><b>frequency</b> (<i>int > 0) &ndash; how frequently in timesteps to record
-            summaries (<span style="color:#00C000"><b>default</b></span>: always).</li>
+            <li><b>frequency</b> (<i>int > 0</i>) &ndash; how frequently in timesteps to record
+            the timestep reward summary (<span style="color:#00C000"><b>default</b></span>:
+            every timestep).</li>
             <li><b>flush</b> (<i>int > 0</i>) &ndash; how frequently in seconds to flush the
             summary writer (<span style="color:#00C000"><b>default</b></span>: 10).</li>
             <li><b>max-summaries</b> (<i>int > 0</i>) &ndash; maximum number of summaries to keep
@@ -198,8 +198,14 @@ class TensorforceAgent(Agent):
             can be masked via an optional "[ACTION-NAME]_mask" state input
             (<span style="color:#00C000"><b>default</b></span>: true).</li>
             <li><b>create_tf_assertions</b> (<i>bool</i>) &ndash; Whether to create internal
-            TensorFlow assertion operations
+            TensorFlow assertion operations, input assertions in act and observe additionally
+            require create_debug_assertions since input values are checked before being passed to
+            TensorFlow
             (<span style="color:#00C000"><b>default</b></span>: true).</li>
+            <li><b>jit_compile</b> (<i>bool</i>) &ndash; Whether to XLA-compile the act and observe
+            functions as well as normalization layers, requires create_tf_assertions to be false
+            and no reward summaries
+            (<span style="color:#00C000"><b>default</b></span>: false).</li>
             <li><b>eager_mode</b> (<i>bool</i>) &ndash; Whether to run functions eagerly instead of
             running as a traced graph function, can be helpful for debugging
             (<span style="color:#00C000"><b>default</b></span>: false).</li>
@@ -231,6 +237,9 @@ class TensorforceAgent(Agent):
             (<span style="color:#C00000"><b>required</b></span>).</li>
             <li><b>flush</b> (<i>int > 0</i>) &ndash; how frequently in seconds to flush the
             summary writer (<span style="color:#00C000"><b>default</b></span>: 10).</li>
+            <li><b>frequency</b> (<i>int > 0</i>) &ndash; how frequently in timesteps to record
+            the timestep reward summary (<span style="color:#00C000"><b>default</b></span>:
+            every timestep).</li>
             <li><b>max_summaries</b> (<i>int > 0</i>) &ndash; maximum number of summaries to keep
             (<span style="color:#00C000"><b>default</b></span>: 5).</li>
             <li><b>labels</b> (<i>"all" | iter[string]</i>) &ndash; which summaries to record
@@ -575,7 +584,7 @@ class TensorforceAgent(Agent):
             )
             self.timesteps = timesteps.numpy().item()
             self.episodes = episodes.numpy().item()
-            self.updates = updates.numpy().item
+            self.updates = updates.numpy().item()
 
         if self.model.saver is not None:
             self.model.save()
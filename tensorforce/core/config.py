@@ -28,6 +28,7 @@ class TensorforceConfig(object):
         device=None,
         eager_mode=False,
         enable_int_action_masking=True,
+        jit_compile=False,
         name='agent',
         seed=None,
         tf_log_level=3
@@ -56,6 +57,9 @@ class TensorforceConfig(object):
         assert isinstance(enable_int_action_masking, bool)
         super().__setattr__('enable_int_action_masking', enable_int_action_masking)
 
+        assert isinstance(jit_compile, bool)
+        super().__setattr__('jit_compile', jit_compile)
+
         assert device is None or isinstance(device, str)  # more specific?
         super().__setattr__('device', device)
 
@@ -17,7 +17,8 @@ import numpy as np
 import tensorflow as tf
 
 from tensorforce import TensorforceError, util
-from tensorforce.core import parameter_modules, TensorSpec, tf_function, tf_util
+from tensorforce.core import parameter_modules, SignatureDict, TensorSpec, tf_function, \
+    tf_util
 from tensorforce.core.layers import Layer, StatefulLayer
 
 
@@ -56,6 +57,9 @@ class LinearNormalization(Layer):
                 value=(self.min_value, self.max_value), hint='not less than'
             )
 
+        self.is_inf = np.logical_or(np.isinf(self.min_value), np.isinf(self.max_value))
+        self.any_inf = bool(self.is_inf.any())
+
         super().__init__(name=name, input_spec=input_spec)
 
     def default_input_spec(self):
@@ -65,31 +69,44 @@ class LinearNormalization(Layer):
 
     def output_spec(self):
         output_spec = super().output_spec()
-        is_inf = np.logical_or(np.isinf(self.min_value), np.isinf(self.max_value))
-        if is_inf.any():
-            output_spec.min_value = np.where(is_inf, self.min_value, -2.0)
-            output_spec.max_value = np.where(is_inf, self.max_value, 2.0)
+        if self.any_inf:
+            output_spec.min_value = np.where(self.is_inf, self.min_value, -2.0)
+            output_spec.max_value = np.where(self.is_inf, self.max_value, 2.0)
         else:
             output_spec.min_value = -2.0
             output_spec.max_value = 2.0
         return output_spec
 
-    @tf_function(num_args=1)
-    def apply(self, *, x):
-        is_inf = np.logical_or(np.isinf(self.min_value), np.isinf(self.max_value))
-        is_inf = tf_util.constant(value=is_inf, dtype='bool')
-        min_value = tf_util.constant(value=self.min_value, dtype='float')
-        max_value = tf_util.constant(value=self.max_value, dtype='float')
+    def initialize(self):
+        super().initialize()
 
-        return tf.where(
-            condition=is_inf, x=x, y=(4.0 * (x - min_value) / (max_value - min_value) - 2.0)
-        )
+        # Affine transformation 4.0 * (x - min_value) / (max_value - min_value) - 2.0 as
+        # (x - shift) * scale + offset without division, subtracting first to preserve precision
+        # for bounds with large offsets (identity for infinite bounds, so no select is required)
+        if self.any_inf:
+            self.shift = np.where(self.is_inf, 0.0, self.min_value)
+            max_value = np.where(self.is_inf, 1.0, self.max_value)
+            self.scale = np.where(self.is_inf, 1.0, 4.0 / (max_value - self.shift))
+            self.offset = np.where(self.is_inf, 0.0, -2.0)
+        else:
+            self.shift = self.min_value
+            self.scale = 4.0 / (self.max_value - self.min_value)
+            self.offset = np.asarray(-2.0)
+
+    @tf_function(num_args=1, jit_compile='config')
+    def apply(self, *, x):
+        # Constants created within the traced function, so they are graph constants
+        shift = tf_util.constant(value=self.shift, dtype='float')
+        scale = tf_util.constant(value=self.scale, dtype='float')
+        offset = tf_util.constant(value=self.offset, dtype='float')
+        return (x - shift) * scale + offset
 
 
 class ExponentialNormalization(StatefulLayer):
     """
     Normalization layer based on the exponential moving average (specification key:
-    `exponential_normalization`).
+    `exponential_normalization`), with variance offset by max(util.epsilon, 1.001e-5), the
+    minimum supported by the fused batch normalization kernel.
 
     Args:
         decay (parameter, 0.0 <= float <= 1.0): Decay rate
@@ -129,6 +146,14 @@ class ExponentialNormalization(StatefulLayer):
         else:
             shape = tuple(1 if axis in self.axes else dims for axis, dims in enumerate(shape))
         shape = (1,) + shape
+        self.moments_axes = (0,) + tuple(1 + axis for axis in self.axes)
+
+        # Normalization over all but last axis is equivalent to per-channel batch normalization,
+        # which is supported by the fused kernel (not worthwhile for scalar inputs, which are
+        # normalized elementwise over the batch axis only)
+        self.is_channels_last = (
+            self.input_spec.rank > 0 and self.axes == tuple(range(self.input_spec.rank - 1))
+        )
 
         self.moving_mean = self.variable(
             name='mean', spec=TensorSpec(type='float', shape=shape), initializer='zeros',
@@ -145,6 +170,28 @@ class ExponentialNormalization(StatefulLayer):
             is_trainable=False, is_saved=True
         )
 
+        # Same epsilon for fused and non-fused normalization, lower-bounded as required by cuDNN
+        self.epsilon = max(util.epsilon, 1.001e-5)
+
+    def input_signature(self, *, function):
+        if function == 'moments':
+            return SignatureDict(x=self.input_spec.signature(batched=True))
+
+        else:
+            return super().input_signature(function=function)
+
+    @tf_function(num_args=1, jit_compile='config')
+    def moments(self, *, x):
+        # Single pass over x: Var[x] = E[x^2] - E[x]^2 (clipped to be non-negative, since subject
+        # to cancellation), with both reductions compiled jointly so they share reads of x
+        mean = tf.math.reduce_mean(input_tensor=x, axis=self.moments_axes, keepdims=True)
+        variance = tf.math.reduce_mean(
+            input_tensor=tf.math.square(x=x), axis=self.moments_axes, keepdims=True
+        )
+        zero = tf_util.constant(value=0.0, dtype='float')
+        variance = tf.maximum(x=(variance - tf.math.square(x=mean)), y=zero)
+        return mean, variance
+
     @tf_function(num_args=1)
     def apply(self, *, x, independent):
         dependencies = list()
@@ -155,40 +202,84 @@ class ExponentialNormalization(StatefulLayer):
 
         else:
             one = tf_util.constant(value=1.0, dtype='float')
-            axes = (0,) + tuple(1 + axis for axis in self.axes)
-
-            decay = self.decay.value()
-            batch_size = tf_util.cast(x=tf.shape(input=x)[0], dtype='float')
-            decay = tf.math.pow(x=decay, y=batch_size)
-            condition = tf.math.logical_or(
-                x=self.after_first_call, y=tf.math.equal(x=batch_size, y=0)
-            )
-
-            mean = tf.math.reduce_mean(input_tensor=x, axis=axes, keepdims=True)
-            mean = tf.where(
-                condition=condition, x=(decay * self.moving_mean + (one - decay) * mean), y=mean
-            )
 
-            variance = tf.reduce_mean(
-                input_tensor=tf.math.squared_difference(x=x, y=mean), axis=axes, keepdims=True
-            )
-            variance = tf.where(
-                condition=condition, x=(decay * self.moving_variance + (one - decay) * variance),
-                y=variance
-            )
+            # Constant decay and static non-zero batch size are resolved at trace time
+            # (batch size checks on the integer shape, cast only for the decay exponent)
+            decay = self.decay.is_constant()
+            if decay is None:
+                decay = self.decay.value()
+            batch_size = tf_util.shape(x=x)[0]
+            if batch_size > 0:
+                is_nonempty = tf_util.constant(value=True, dtype='bool')
+            else:
+                batch_size = tf.shape(input=x)[0]
+                is_nonempty = (batch_size > 0)
+
+            def update_statistics():
+                # Statistics are not differentiated through (moving averages are non-trainable)
+                batch_mean, batch_variance = self.moments(x=tf.stop_gradient(input=x))
+
+                def moving_average():
+                    if isinstance(decay, float) and isinstance(batch_size, int):
+                        batch_decay = tf_util.constant(value=(decay ** batch_size), dtype='float')
+                    else:
+                        batch_size_float = tf_util.cast(x=batch_size, dtype='float')
+                        batch_decay = tf.math.pow(x=decay, y=batch_size_float)
+                    moving_mean, moving_variance = keep_statistics()
+                    mean = batch_decay * moving_mean + (one - batch_decay) * batch_mean
+                    variance = batch_decay * moving_variance + \
+                        (one - batch_decay) * batch_variance
+                    return mean, variance
+
+                def batch_statistics():
+                    return batch_mean, batch_variance
+
+                after_first_call = tf_util.identity(input=self.after_first_call)
+                return tf.cond(
+                    pred=after_first_call, true_fn=moving_average, false_fn=batch_statistics
+                )
+
+            def keep_statistics():
+                moving_mean = tf_util.identity(input=self.moving_mean)
+                moving_variance = tf_util.identity(input=self.moving_variance)
+                return moving_mean, moving_variance
+
+            # Skip statistics update entirely for empty batch
+            if isinstance(batch_size, int):
+                mean, variance = update_statistics()
+            else:
+                mean, variance = tf.cond(
+                    pred=is_nonempty, true_fn=update_statistics, false_fn=keep_statistics
+                )
 
             with tf.control_dependencies(control_inputs=(mean, variance)):
-                value = tf.math.logical_or(x=self.after_first_call, y=(batch_size > 0))
-                dependencies.append(self.after_first_call.assign(value=value, read_value=False))
-
-            mean = self.moving_mean.assign(value=mean)
-            variance = self.moving_variance.assign(value=variance)
-
-        epsilon = tf_util.constant(value=util.epsilon, dtype='float')
-        reciprocal_stddev = tf.math.rsqrt(x=tf.maximum(x=variance, y=epsilon))
+                value = tf.math.logical_or(x=self.after_first_call, y=is_nonempty)
+                dependencies.append(tf.group(
+                    self.moving_mean.assign(value=mean, read_value=False),
+                    self.moving_variance.assign(value=variance, read_value=False),
+                    self.after_first_call.assign(value=value, read_value=False)
+                ))
 
         with tf.control_dependencies(control_inputs=dependencies):
-            x = (x - tf.stop_gradient(input=mean)) * tf.stop_gradient(input=reciprocal_stddev)
+            if self.is_channels_last:
+                # Fused inference-mode batch normalization with the given statistics, with batch
+                # and all but last axis flattened into the (NHWC) batch axis
+                num_channels = mean.shape[-1]
+                mean = tf.reshape(tensor=mean, shape=(num_channels,))
+                variance = tf.reshape(tensor=variance, shape=(num_channels,))
+                # (raw op to avoid wrapper overhead)
+                normalized = tf.raw_ops.FusedBatchNormV3(
+                    x=tf.reshape(tensor=x, shape=(-1, 1, 1, num_channels)),
+                    scale=tf_util.ones(shape=(num_channels,), dtype='float'),
+                    offset=tf_util.zeros(shape=(num_channels,), dtype='float'),
+                    mean=mean, variance=variance,
+                    epsilon=self.epsilon, data_format='NHWC', is_training=False
+                ).y
+                x = tf.reshape(tensor=normalized, shape=tf.shape(input=x))
+
+            else:
+                epsilon = tf_util.constant(value=self.epsilon, dtype='float')
+                x = (x - mean) * tf.math.rsqrt(x=(variance + epsilon))
 
         return x
 
@@ -213,21 +304,26 @@ class InstanceNormalization(Layer):
     def default_input_spec(self):
         return TensorSpec(type='float', shape=None)
 
-    @tf_function(num_args=1)
-    def apply(self, *, x):
-        epsilon = tf_util.constant(value=util.epsilon, dtype='float')
+    def initialize(self):
+        super().initialize()
+
+        self.epsilon = util.epsilon
 
         if self.axes is None:
-            mean, variance = tf.nn.moments(
-                x=x, axes=tuple(range(1, self.input_spec.rank)), keepdims=True
-            )
+            self.moments_axes = tuple(range(1, self.input_spec.rank))
         else:
-            mean, variance = tf.nn.moments(
-                x=x, axes=tuple(1 + axis for axis in self.axes), keepdims=True
-            )
+            self.moments_axes = tuple(1 + axis for axis in self.axes)
+
+    @tf_function(num_args=1, jit_compile='config')
+    def apply(self, *, x):
+        # Statistics are not differentiated through
+        mean, variance = tf.nn.moments(
+            x=tf.stop_gradient(input=x), axes=self.moments_axes, keepdims=True
+        )
 
-        reciprocal_stddev = tf.math.rsqrt(x=tf.maximum(x=variance, y=epsilon))
+        epsilon = tf_util.constant(value=self.epsilon, dtype='float')
+        reciprocal_stddev = tf.math.rsqrt(x=(variance + epsilon))
 
-        x = (x - tf.stop_gradient(input=mean)) * tf.stop_gradient(input=reciprocal_stddev)
+        x = (x - mean) * reciprocal_stddev
 
         return x
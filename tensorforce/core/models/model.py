@@ -14,17 +14,230 @@
 # ==============================================================================
 
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import json
 import logging
 import os
 import time
 
-import h5py
 import numpy as np
 import tensorflow as tf
+from tensorflow.python.training.tracking.data_structures import NoDependency
 
 from tensorforce import TensorforceError, util
 from tensorforce.core import ArrayDict, Module, SignatureDict, TensorDict, TensorSpec, \
-    TensorsSpec, tf_function, tf_util, VariableDict
+    TensorsSpec, tf_function, tf_util
+
+
+# Variables smaller than this are packed into a single hdf5 dataset/npz entry per dtype
+PACKED_MAX_BYTES = 65536
+# Maximum chunk size of (compressed) hdf5 datasets
+HDF5_CHUNK_MAX_BYTES = 1048576
+# Chunk cache of hdf5 files opened for restore (h5py default is 1MB)
+HDF5_CHUNK_CACHE_BYTES = 268435456
+HDF5_CHUNK_CACHE_SLOTS = 100003
+# File buffer size of numpy/raw writes
+WRITE_BUFFER_BYTES = 16777216
+# Alignment of variables within raw files
+RAW_ALIGNMENT_BYTES = 64
+
+
+def pack_variables(*, variables):
+    # Small variables are concatenated per dtype into one array with an (name, offset, shape)
+    # index, since per-dataset/entry overhead dominates for those
+    unpacked = OrderedDict()
+    packed = OrderedDict()
+    for name, value in variables.items():
+        if value.nbytes < PACKED_MAX_BYTES:
+            packed.setdefault(value.dtype.name, list()).append((name, value))
+        else:
+            unpacked[name] = value
+    for dtype, values in packed.items():
+        index = list()
+        offset = 0
+        for name, value in values:
+            index.append((name, offset, value.shape))
+            offset += value.size
+        data = np.concatenate([value.reshape(-1) for _, value in values])
+        packed[dtype] = (data, json.dumps(index))
+    return unpacked, packed
+
+
+def unpack_variables(*, data, index, variables):
+    for name, offset, shape in json.loads(index):
+        size = util.product(xs=shape)
+        variables[name] = data[offset: offset + size].reshape(shape)
+
+
+def hdf5_chunks(*, shape, itemsize):
+    # Split leading axes first, so chunks keep trailing axes contiguous
+    chunks = list(shape)
+    for axis in range(len(chunks)):
+        size = util.product(xs=chunks[axis + 1:]) * itemsize
+        if size * chunks[axis] <= HDF5_CHUNK_MAX_BYTES:
+            break
+        chunks[axis] = max(HDF5_CHUNK_MAX_BYTES // size, 1)
+    return tuple(chunks)
+
+
+def hdf5_file(*, path, mode):
+    import h5py
+
+    if mode == 'r':
+        # Skip advisory file locking, which is slow or unsupported on network filesystems
+        kwargs = dict(
+            rdcc_nbytes=HDF5_CHUNK_CACHE_BYTES, rdcc_nslots=HDF5_CHUNK_CACHE_SLOTS, locking=False
+        )
+    else:
+        # Latest file format, for instance v2 B-tree chunk indices
+        kwargs = dict(libver='latest')
+    try:
+        return h5py.File(name=path, mode=mode, **kwargs)
+    except TypeError:
+        # File locking argument only supported by h5py >= 3.5
+        kwargs.pop('locking', None)
+        return h5py.File(name=path, mode=mode, **kwargs)
+
+
+def async_checkpoint_options():
+    # Native asynchronous checkpoint writing, only supported by TensorFlow >= 2.9
+    try:
+        return tf.train.CheckpointOptions(experimental_enable_async_checkpoint=True)
+    except (AttributeError, TypeError):
+        return None
+
+
+def hdf5_read(*, dataset):
+    # Read into a preallocated array, bypassing h5py's generic indexing path
+    if dataset.ndim == 0 or dataset.size == 0:
+        return dataset[()]
+    value = np.empty(shape=dataset.shape, dtype=dataset.dtype)
+    dataset.read_direct(dest=value)
+    return value
+
+
+def prefetch_file(*, filehandle):
+    # Start kernel readahead of the entire file, which overlaps with subsequent parsing
+    if hasattr(os, 'posix_fadvise'):
+        os.posix_fadvise(filehandle.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+
+
+def load_variables(*, path, names):
+    # Cache key includes size and inode besides modification time, since the latter may not
+    # change for a rewrite within the timestamp resolution of the filesystem
+    stat = os.stat(path)
+    version = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+    return read_variables(path=path, version=version, names=names)
+
+
+@functools.lru_cache(maxsize=1)
+def read_variables(*, path, version, names):
+    # Only the most recently restored numpy/hdf5/raw file is cached, so repeated restores of the
+    # same file skip disk IO without keeping several checkpoints in memory, cleared by every save
+    if path.endswith('.npz'):
+        with open(path, 'rb') as filehandle:
+            prefetch_file(filehandle=filehandle)
+            # No mmap_mode, since np.load ignores it for npz archives (members are zip entries)
+            with np.load(file=filehandle, allow_pickle=False) as npz_file:
+                variables = dict()
+                for key in npz_file.files:
+                    if key.startswith('__packed_'):
+                        index = npz_file['__index_' + key[9:]].item()
+                        unpack_variables(data=npz_file[key], index=index, variables=variables)
+                return {
+                    name: (variables[name] if name in variables else npz_file[name])
+                    for name in names
+                }
+    elif path.endswith('.bin'):
+        with open(path, 'rb') as datahandle:
+            prefetch_file(filehandle=datahandle)
+            with open(path[:-4] + '.idx.json', 'r') as filehandle:
+                index = json.load(fp=filehandle)
+            # Single read of the entire file, variables are views into the buffer (not
+            # memory-mapped, since cached arrays would otherwise be invalidated when the file is
+            # overwritten)
+            data = np.fromfile(datahandle, dtype=np.uint8)
+        variables = dict()
+        for name, offset, dtype, shape in index:
+            dtype = np.dtype(dtype)
+            size = util.product(xs=shape) * dtype.itemsize
+            variables[name] = data[offset: offset + size].view(dtype).reshape(shape)
+        return {name: variables[name] for name in names}
+    else:
+        import h5py
+
+        with hdf5_file(path=path, mode='r') as filehandle:
+            # Single pass over all datasets, instead of a path lookup per variable name (names
+            # containing "/" are stored in nested groups)
+            requested = set(names)
+            variables = dict()
+
+            def read_dataset(key, dataset):
+                if not isinstance(dataset, h5py.Dataset):
+                    pass
+                elif key.startswith('__packed_'):
+                    unpack_variables(
+                        data=hdf5_read(dataset=dataset), index=dataset.attrs['index'],
+                        variables=variables
+                    )
+                elif key in requested:
+                    variables[key] = hdf5_read(dataset=dataset)
+
+            filehandle.visititems(read_dataset)
+            return {name: variables[name] for name in names}
+
+
+def write_variables(*, path, variables, compression=None):
+    # Counterpart of load_variables, may run on the asynchronous save thread
+    read_variables.cache_clear()
+    if path.endswith('.npz'):
+        # Packed small variables with index as string array, so restore requires no pickle
+        variables, packed = pack_variables(variables=variables)
+        for dtype, (data, index) in packed.items():
+            variables['__packed_' + dtype] = data
+            variables['__index_' + dtype] = np.array(index)
+        # Large user-space buffer, so the many small zip header/member writes are coalesced
+        with open(path, 'wb', buffering=WRITE_BUFFER_BYTES) as filehandle:
+            np.savez(file=filehandle, **variables)
+    elif path.endswith('.bin'):
+        # Flat concatenation of variable buffers plus (name, offset, dtype, shape) JSON index,
+        # written in one buffered pass without zip framing and CRC computation
+        index = list()
+        with open(path, 'wb', buffering=WRITE_BUFFER_BYTES) as filehandle:
+            offset = 0
+            for name, value in variables.items():
+                padding = -offset % RAW_ALIGNMENT_BYTES
+                filehandle.write(bytes(padding))
+                offset += padding
+                index.append((name, offset, value.dtype.str, value.shape))
+                # (ascontiguousarray would turn scalars into 1-d arrays, and memoryview cannot
+                # cast zero-size arrays, for which the index entry suffices)
+                if value.nbytes > 0:
+                    filehandle.write(memoryview(np.require(value, requirements='C')).cast('B'))
+                    offset += value.nbytes
+        with open(path[:-4] + '.idx.json', 'w') as filehandle:
+            json.dump(obj=index, fp=filehandle)
+    else:
+        # Datasets are written serially, since h5py serializes all HDF5 calls (including filter
+        # compression) behind a global lock, so a thread pool would not overlap them, instead
+        # asynchronous saves overlap the entire write with training
+        with hdf5_file(path=path, mode='w') as filehandle:
+            variables, packed = pack_variables(variables=variables)
+            for name, value in variables.items():
+                if compression is None:
+                    # Contiguous layout, chunking is only required by compression filters
+                    filehandle.create_dataset(name=name, data=value, chunks=None)
+                else:
+                    # Byte shuffle improves compression ratio of float data
+                    chunks = hdf5_chunks(shape=value.shape, itemsize=value.itemsize)
+                    filehandle.create_dataset(
+                        name=name, data=value, chunks=chunks, compression=compression,
+                        shuffle=True
+                    )
+            for dtype, (data, index) in packed.items():
+                dataset = filehandle.create_dataset(name=('__packed_' + dtype), data=data)
+                dataset.attrs['index'] = index
 
 
 class Model(Module):
@@ -50,6 +263,20 @@ class Model(Module):
         # Keep track of tensor names to check for collisions
         self.value_names = set()
 
+        # API function signatures, cached by input_signature()
+        self.api_signatures = dict()
+
+        # Asynchronous numpy/hdf5/raw saving, single worker so writes stay ordered
+        self.save_executor = None
+        self.pending_save = None
+        # Whether an asynchronous checkpoint write may be pending
+        self.pending_checkpoint = False
+
+        # File keys of saved variables, cached by named_saved_variables()
+        self.saved_variable_names = None
+        # Graph function assigning all saved variables, created by assign_saved_variables()
+        self.saved_variables_assign = None
+
         # Terminal specification
         self.terminal_spec = TensorSpec(type='int', shape=(), num_values=3)
         self.value_names.add('terminal')
@@ -62,9 +289,23 @@ class Model(Module):
         self.parallel_spec = TensorSpec(type='int', shape=(), num_values=parallel_interactions)
         self.value_names.add('parallel')
 
+        # Vectorized check for missing/infinite float bounds, so the per-spec loops below only run
+        # to report the offending specs
+        def is_unbounded(specs):
+            bounds = [
+                bound for spec in specs.values() if spec.type == 'float'
+                for bound in (spec.min_value, spec.max_value)
+            ]
+            if any(bound is None for bound in bounds):
+                return True
+            elif len(bounds) == 0:
+                return False
+            bounds = np.concatenate([np.ravel(bound) for bound in bounds])
+            return bool(np.isinf(bounds).any())
+
         # State space specification
         self.states_spec = states
-        for name, spec in self.states_spec.items():
+        for name, spec in (self.states_spec.items() if is_unbounded(states) else ()):
             if spec.type != 'float':
                 continue
             elif spec.min_value is None:
@@ -84,7 +325,7 @@ class Model(Module):
 
         # Action space specification
         self.actions_spec = actions
-        for name, spec in self.actions_spec.items():
+        for name, spec in (self.actions_spec.items() if is_unbounded(actions) else ()):
             if spec.type != 'float':
                 continue
             elif spec.min_value is None:
@@ -143,11 +384,12 @@ class Model(Module):
             self.summarizer = None
             self.summary_labels = frozenset()
         elif not all(
-            key in ('directory', 'flush', 'labels', 'max_summaries') for key in summarizer
+            key in ('directory', 'flush', 'frequency', 'labels', 'max_summaries')
+            for key in summarizer
         ):
             raise TensorforceError.value(
                 name='agent', argument='summarizer', value=list(summarizer),
-                hint='not from {directory,flush,labels,max_summaries}'
+                hint='not from {directory,flush,frequency,labels,max_summaries}'
             )
         elif 'directory' not in summarizer:
             raise TensorforceError.required(name='agent', argument='summarizer[directory]')
@@ -165,6 +407,13 @@ class Model(Module):
             else:
                 self.summary_labels = frozenset(summary_labels)
 
+            # Timestep frequency of timestep-based reward summaries
+            self.summary_frequency = summarizer.get('frequency', 1)
+            if not isinstance(self.summary_frequency, int) or self.summary_frequency <= 0:
+                raise TensorforceError.value(
+                    name='agent', argument='summarizer[frequency]', value=self.summary_frequency
+                )
+
     @property
     def root(self):
         return self
@@ -176,9 +425,61 @@ class Model(Module):
     def close(self):
         if self.saver is not None:
             self.save()
+        self.wait_for_save()
+        if self.save_executor is not None:
+            self.save_executor.shutdown()
+            self.save_executor = None
         if self.summarizer is not None:
             self.summarizer.close()
 
+    def wait_for_save(self):
+        # Barrier for a pending asynchronous save, re-raises its exception if it failed
+        if self.pending_save is not None:
+            pending_save = self.pending_save
+            self.pending_save = None
+            pending_save.result()
+        if self.pending_checkpoint:
+            self.pending_checkpoint = False
+            self.checkpoint.sync()
+
+    def named_saved_variables(self):
+        # Name slicing only once, since the set of saved variables is fixed after initialization
+        # (only names are cached, variables on self would be listed twice by saved/trainable
+        # variables, and NoDependency avoids a tuple checkpoint dependency)
+        saved_variables = self.saved_variables
+        if self.saved_variable_names is None:
+            assert self.is_initialized
+            prefix_length = len(self.name) + 1
+            self.saved_variable_names = NoDependency(tuple(
+                variable.name[prefix_length: -2] for variable in saved_variables
+            ))
+        return OrderedDict(zip(self.saved_variable_names, saved_variables))
+
+    def assign_saved_variables(self, *, values):
+        # One graph function call instead of an eager assign op per variable, traced once since
+        # value shapes are fixed
+        saved_variables = self.named_saved_variables()
+        if self.saved_variables_assign is None:
+            variables = tuple(saved_variables.values())
+
+            def assign(values):
+                # Cast is a no-op unless the file dtype differs
+                return tf.group(*(
+                    variable.assign(
+                        value=tf.cast(x=value, dtype=variable.dtype), read_value=False
+                    ) for variable, value in zip(variables, values)
+                ))
+
+            function = tf.function(func=assign)
+
+            # Plain Python wrapper, since tf.function attributes are tracked and exported by
+            # SavedModel
+            def assign_saved_variables(values):
+                return function(values)
+
+            self.saved_variables_assign = assign_saved_variables
+        self.saved_variables_assign(tuple(values[name] for name in saved_variables))
+
     def __enter__(self):
         assert self.is_initialized is not None
         if self.is_initialized:
@@ -247,6 +548,8 @@ class Model(Module):
             if self.saver is not None:
                 self.saver_directory = self.saver['directory']
                 self.saver_filename = self.saver.get('filename', self.name)
+                self.saver_frequency = self.saver['frequency']
+                self.saver_last_step = None
                 load = self.saver.get('load', False)
                 # with tf.name_scope(name='saver'):
                 self.checkpoint = tf.train.Checkpoint(**{self.name: self})
@@ -274,55 +577,102 @@ class Model(Module):
                 self.save()
 
     def core_initialize(self):
+        # Counters and buffers are per-replica, so avoid synchronizing them on every update
+        synchronization = tf.VariableSynchronization.ON_READ
+        aggregation = tf.VariableAggregation.ONLY_FIRST_REPLICA
+
         # Timestep counter
         self.timesteps = self.variable(
             name='timesteps', spec=TensorSpec(type='int'), initializer='zeros', is_trainable=False,
-            is_saved=True
+            is_saved=True, synchronization=synchronization, aggregation=aggregation
         )
 
         # Episode counter
         self.episodes = self.variable(
             name='episodes', spec=TensorSpec(type='int'), initializer='zeros', is_trainable=False,
-            is_saved=True
+            is_saved=True, synchronization=synchronization, aggregation=aggregation
         )
 
         # Update counter
         self.updates = self.variable(
             name='updates', spec=TensorSpec(type='int'), initializer='zeros', is_trainable=False,
-            is_saved=True
+            is_saved=True, synchronization=synchronization, aggregation=aggregation
         )
 
         # Episode reward
         self.episode_reward = self.variable(
             name='episode-reward',
             spec=TensorSpec(type=self.reward_spec.type, shape=(self.parallel_interactions,)),
-            initializer='zeros', is_trainable=False, is_saved=False
+            initializer='zeros', is_trainable=False, is_saved=False,
+            synchronization=synchronization, aggregation=aggregation
         )
 
-        # Internals buffers
-        def function(name, spec, initial):
-            shape = (self.parallel_interactions,) + spec.shape
-            reps = (self.parallel_interactions,) + tuple(1 for _ in range(spec.rank))
-            initializer = np.tile(np.expand_dims(initial, axis=0), reps=reps)
-            return self.variable(
-                name=(name.replace('/', '_') + '-buffer'),
-                spec=TensorSpec(type=spec.type, shape=shape), initializer=initializer,
-                is_trainable=False, is_saved=False
+        # Internals buffers, packed per type into one (parallel_interactions, size) variable, so
+        # all internals are retrieved/remembered via a single gather/scatter per type
+        self.internals_names = tuple(self.internals_spec)
+        layouts = OrderedDict()
+        initials = OrderedDict()
+        for name, spec, initial in self.internals_spec.zip_items(self.internals_init):
+            if spec.type not in layouts:
+                layouts[spec.type] = list()
+                initials[spec.type] = list()
+            layouts[spec.type].append((name, (-1,) + spec.shape, spec.size))
+            initials[spec.type].append(np.reshape(initial, (spec.size,)))
+
+        # Static (names, shapes, sizes) layout per type, unpacked once here instead of per call
+        self.internals_layout = OrderedDict(
+            (type, tuple(zip(*layout))) for type, layout in layouts.items()
+        )
+        self.internals_initial = OrderedDict()
+        self.previous_internals = OrderedDict()
+        for type, initial in initials.items():
+            initial = np.concatenate(initial, axis=0).astype(util.np_dtype(dtype=type))
+            self.internals_initial[type] = initial
+            shape = (self.parallel_interactions,) + initial.shape
+            initializer = tf.broadcast_to(
+                input=tf_util.constant(value=initial, dtype=type), shape=shape
+            )
+            self.previous_internals[type] = self.variable(
+                name=('internals-' + type + '-buffer'),
+                spec=TensorSpec(type=type, shape=shape), initializer=initializer,
+                is_trainable=False, is_saved=False, synchronization=synchronization,
+                aggregation=aggregation
             )
 
-        self.previous_internals = self.internals_spec.fmap(
-            function=function, cls=VariableDict, with_names=True, zip_values=self.internals_init
-        )
+    def retrieve_internals(self, *, parallel):
+        values = dict()
+        for type, (names, shapes, sizes) in self.internals_layout.items():
+            packed = tf.gather(params=self.previous_internals[type], indices=parallel)
+            unpacked = tf.split(value=packed, num_or_size_splits=sizes, axis=1)
+            for name, shape, value in zip(names, shapes, unpacked):
+                values[name] = tf.reshape(tensor=value, shape=shape)
+        return TensorDict(((name, values[name]) for name in self.internals_names))
+
+    def remember_internals(self, *, internals, parallel):
+        # Raw scatter ops sharing the parallel indices, without IndexedSlices or read value
+        operations = list()
+        for type, (names, _, sizes) in self.internals_layout.items():
+            packed = tf.concat(values=[
+                tf.reshape(tensor=internals[name], shape=(-1, size))
+                for name, size in zip(names, sizes)
+            ], axis=1)
+            operations.append(tf.raw_ops.ResourceScatterUpdate(
+                resource=self.previous_internals[type].handle, indices=parallel, updates=packed
+            ))
+        return [tf.group(*operations)]
 
     def initialize_api(self):
-        if self.summary_labels == 'all' or 'graph' in self.summary_labels:
+        # Graph summaries: trace each API function while calling it once
+        do_graph_trace = (self.summary_labels == 'all' or 'graph' in self.summary_labels)
+
+        if do_graph_trace:
             tf.summary.trace_on(graph=True, profiler=False)
         self.act(
             states=self.states_spec.empty(batched=True),
             auxiliaries=self.auxiliaries_spec.empty(batched=True),
             parallel=self.parallel_spec.empty(batched=True)
         )
-        if self.summary_labels == 'all' or 'graph' in self.summary_labels:
+        if do_graph_trace:
             tf.summary.trace_export(name='act', step=self.timesteps, profiler_outdir=None)
             tf.summary.trace_on(graph=True, profiler=False)
         kwargs = dict(states=self.states_spec.empty(batched=True))
@@ -331,7 +681,7 @@ class Model(Module):
         if len(self.auxiliaries_spec) > 0:
             kwargs['auxiliaries'] = self.auxiliaries_spec.empty(batched=True)
         self.independent_act(**kwargs)
-        if self.summary_labels == 'all' or 'graph' in self.summary_labels:
+        if do_graph_trace:
             tf.summary.trace_export(
                 name='independent-act', step=self.timesteps, profiler_outdir=None
             )
@@ -341,19 +691,23 @@ class Model(Module):
             reward=self.reward_spec.empty(batched=True),
             parallel=self.parallel_spec.empty(batched=False)
         )
-        if self.summary_labels == 'all' or 'graph' in self.summary_labels:
+        if do_graph_trace:
             tf.summary.trace_export(name='observe', step=self.timesteps, profiler_outdir=None)
 
     def input_signature(self, *, function):
+        # Cached, since specs are final once API functions are called
+        if function in self.api_signatures:
+            return self.api_signatures[function]
+
         if function == 'act':
-            return SignatureDict(
+            signature = SignatureDict(
                 states=self.states_spec.signature(batched=True),
                 auxiliaries=self.auxiliaries_spec.signature(batched=True),
                 parallel=self.parallel_spec.signature(batched=True)
             )
 
         elif function == 'core_act':
-            return SignatureDict(
+            signature = SignatureDict(
                 states=self.states_spec.signature(batched=True),
                 internals=self.internals_spec.signature(batched=True),
                 auxiliaries=self.auxiliaries_spec.signature(batched=True),
@@ -361,7 +715,7 @@ class Model(Module):
             )
 
         elif function == 'core_observe':
-            return SignatureDict(
+            signature = SignatureDict(
                 terminal=self.terminal_spec.signature(batched=True),
                 reward=self.reward_spec.signature(batched=True),
                 parallel=self.parallel_spec.signature(batched=False)
@@ -373,21 +727,23 @@ class Model(Module):
                 signature['internals'] = self.internals_spec.signature(batched=True)
             if len(self.auxiliaries_spec) > 0:
                 signature['auxiliaries'] = self.auxiliaries_spec.signature(batched=True)
-            return signature
 
         elif function == 'observe':
-            return SignatureDict(
+            signature = SignatureDict(
                 terminal=self.terminal_spec.signature(batched=True),
                 reward=self.reward_spec.signature(batched=True),
                 parallel=self.parallel_spec.signature(batched=False)
             )
 
         elif function == 'reset':
-            return SignatureDict()
+            signature = SignatureDict()
 
         else:
             return super().input_signature(function=function)
 
+        self.api_signatures[function] = signature
+        return signature
+
     @tf_function(num_args=0)
     def reset(self):
         timestep = tf_util.identity(input=self.timesteps)
@@ -395,7 +751,7 @@ class Model(Module):
         update = tf_util.identity(input=self.updates)
         return timestep, episode, update
 
-    @tf_function(num_args=3, optional=2)
+    @tf_function(num_args=3, optional=2, jit_compile='config')
     def independent_act(self, *, states, internals=None, auxiliaries=None):
         if internals is None:
             assert len(self.internals_spec) == 0
@@ -403,12 +759,12 @@ class Model(Module):
         if auxiliaries is None:
             assert len(self.auxiliaries_spec) == 0
             auxiliaries = TensorDict()
-        true = tf_util.constant(value=True, dtype='bool')
         batch_size = tf_util.cast(x=tf.shape(input=states.value())[0], dtype='int')
 
         # Input assertions
         assertions = list()
-        if self.config.create_tf_assertions:
+        if self.config.create_tf_assertions and self.config.create_debug_assertions:
+            true = tf_util.constant(value=True, dtype='bool')
             assertions.extend(self.states_spec.tf_assert(
                 x=states, batch_size=batch_size,
                 message='Agent.independent_act: invalid {issue} for {name} state input.'
@@ -443,18 +799,24 @@ class Model(Module):
 
             # SavedModel requires flattened output
             if len(self.internals_spec) > 0:
-                return OrderedDict(TensorDict(actions=actions, internals=internals))
+                outputs = OrderedDict(
+                    ('actions/' + name, action) for name, action in actions.items()
+                )
+                outputs.update(
+                    ('internals/' + name, internal) for name, internal in internals.items()
+                )
+                return outputs
             else:
                 return OrderedDict(actions)
 
-    @tf_function(num_args=3)
+    @tf_function(num_args=3, jit_compile='config')
     def act(self, *, states, auxiliaries, parallel):
-        true = tf_util.constant(value=True, dtype='bool')
         batch_size = tf_util.cast(x=tf.shape(input=parallel)[0], dtype='int')
 
         # Input assertions
         assertions = list()
-        if self.config.create_tf_assertions:
+        if self.config.create_tf_assertions and self.config.create_debug_assertions:
+            true = tf_util.constant(value=True, dtype='bool')
             assertions.extend(self.states_spec.tf_assert(
                 x=states, batch_size=batch_size,
                 message='Agent.act: invalid {issue} for {name} state input.'
@@ -480,9 +842,7 @@ class Model(Module):
 
         with tf.control_dependencies(control_inputs=assertions):
             # Retrieve internals
-            internals = self.previous_internals.fmap(
-                function=(lambda x: tf.gather(params=x, indices=parallel)), cls=TensorDict
-            )
+            internals = self.retrieve_internals(parallel=parallel)
 
             # Core act
             actions, internals = self.core_act(
@@ -492,7 +852,7 @@ class Model(Module):
 
         # Action assertions
         assertions = list()
-        if self.config.create_tf_assertions:
+        if self.config.create_tf_assertions and self.config.create_debug_assertions:
             assertions.extend(self.actions_spec.tf_assert(x=actions, batch_size=batch_size))
             if self.config.enable_int_action_masking:
                 for name, spec, action in self.actions_spec.zip_items(actions):
@@ -507,30 +867,27 @@ class Model(Module):
                         ))
 
         # Remember internals
-        dependencies = list()
-        for name, previous, internal in self.previous_internals.zip_items(internals):
-            sparse_delta = tf.IndexedSlices(values=internal, indices=parallel)
-            dependencies.append(previous.scatter_update(sparse_delta=sparse_delta))
+        dependencies = self.remember_internals(internals=internals, parallel=parallel)
 
-        # Increment timestep (after core act)
-        with tf.control_dependencies(control_inputs=(actions.flatten() + internals.flatten())):
-            dependencies.append(self.timesteps.assign_add(delta=batch_size, read_value=False))
+        # Increment timestep (after core act, ordered by automatic control dependencies on the
+        # timesteps variable, so no explicit dependency on every action/internal is required)
+        dependencies.append(self.timesteps.assign_add(delta=batch_size, read_value=False))
 
         with tf.control_dependencies(control_inputs=(dependencies + assertions)):
             actions = actions.fmap(function=tf_util.identity)
             timestep = tf_util.identity(input=self.timesteps)
             return actions, timestep
 
-    @tf_function(num_args=3)
+    @tf_function(num_args=3, jit_compile='config')
     def observe(self, *, terminal, reward, parallel):
         zero = tf_util.constant(value=0, dtype='int')
-        one = tf_util.constant(value=1, dtype='int')
         batch_size = tf_util.cast(x=tf.shape(input=terminal)[0], dtype='int')
-        is_terminal = tf.concat(values=([zero], terminal), axis=0)[-1] > zero
+        # At most one terminal which is the last timestep (see assertions below)
+        is_terminal = tf.math.reduce_any(input_tensor=tf.math.greater(x=terminal, y=zero))
 
         # Input assertions
         assertions = list()
-        if self.config.create_tf_assertions:
+        if self.config.create_tf_assertions and self.config.create_debug_assertions:
             assertions.extend(self.terminal_spec.tf_assert(
                 x=terminal, batch_size=batch_size,
                 message='Agent.observe: invalid {issue} for terminal input.'
@@ -543,70 +900,83 @@ class Model(Module):
                 x=parallel, message='Agent.observe: invalid {issue} for parallel input.'
             ))
             # Assertion: at most one terminal
+            one = tf_util.constant(value=1, dtype='int')
             assertions.append(tf.debugging.assert_less_equal(
                 x=tf_util.cast(x=tf.math.count_nonzero(input=terminal), dtype='int'), y=one,
                 message="Agent.observe: input contains more than one terminal."
             ))
             # Assertion: if terminal, last timestep in batch
             assertions.append(tf.debugging.assert_equal(
-                x=tf.math.reduce_any(input_tensor=tf.math.greater(x=terminal, y=zero)), y=is_terminal,
+                x=is_terminal, y=(tf.concat(values=([zero], terminal), axis=0)[-1] > zero),
                 message="Agent.observe: terminal is not the last input timestep."
             ))
 
         with tf.control_dependencies(control_inputs=assertions):
             dependencies = list()
 
-            # Reward summary
+            # Reward summary (decided at trace time, recorded every summary_frequency timesteps)
             if self.summary_labels == 'all' or 'reward' in self.summary_labels:
-                with self.summarizer.as_default():
+                if self.summary_frequency > 1:
+                    frequency = tf_util.constant(value=self.summary_frequency, dtype='int')
+                    condition = tf.math.equal(
+                        x=tf.math.floormod(x=self.timesteps, y=frequency), y=zero
+                    )
+                else:
+                    condition = True
+                with self.summarizer.as_default(), tf.summary.record_if(condition=condition):
                     x = tf.math.reduce_mean(input_tensor=reward)
                     tf.summary.scalar(name='reward', data=x, step=self.timesteps)
 
             # Update episode reward
-            sum_reward = tf.math.reduce_sum(input_tensor=reward)
-            sparse_delta = tf.IndexedSlices(values=sum_reward, indices=parallel)
-            dependencies.append(self.episode_reward.scatter_add(sparse_delta=sparse_delta))
+            sum_reward = tf.math.reduce_sum(input_tensor=reward, keepdims=True)
+            index = tf.expand_dims(input=tf.expand_dims(input=parallel, axis=0), axis=1)
+            episode_reward = tf.tensor_scatter_nd_add(
+                tensor=self.episode_reward, indices=index, updates=sum_reward
+            )
+            dependencies.append(self.episode_reward.assign(value=episode_reward, read_value=False))
 
             # Core observe (before terminal handling)
             updated = self.core_observe(terminal=terminal, reward=reward, parallel=parallel)
             dependencies.append(updated)
 
-        # Handle terminal (after core observe and episode reward)
+        # Handle terminal (after core observe and episode reward), applied unconditionally as
+        # masked updates instead of via tf.cond
         with tf.control_dependencies(control_inputs=dependencies):
-
-            def fn_terminal():
-                operations = list()
-
-                # Reset internals
-                def function(spec, initial):
-                    return tf_util.constant(value=initial, dtype=spec.type)
-
-                initials = self.internals_spec.fmap(
-                    function=function, cls=TensorDict, zip_values=self.internals_init
+            operations = list()
+
+            # Reset internals
+            for type, initial in self.internals_initial.items():
+                initial = tf_util.constant(value=initial, dtype=type)
+                previous = self.previous_internals[type]
+                internals = tf.where(
+                    condition=is_terminal, x=initial, y=tf.gather(params=previous, indices=parallel)
                 )
-                for name, previous, initial in self.previous_internals.zip_items(initials):
-                    sparse_delta = tf.IndexedSlices(values=initial, indices=parallel)
-                    operations.append(previous.scatter_update(sparse_delta=sparse_delta))
-
-                # Episode reward summaries (before episode reward reset / episodes increment)
-                if self.summary_labels == 'all' or 'reward' in self.summary_labels:
-                    with self.summarizer.as_default():
-                        x = tf.gather(params=self.episode_reward, indices=parallel)
-                        tf.summary.scalar(name='episode-reward', data=x, step=self.episodes)
-
-                # Reset episode reward
-                zero_float = tf_util.constant(value=0.0, dtype='float')
-                sparse_delta = tf.IndexedSlices(values=zero_float, indices=parallel)
-                operations.append(self.episode_reward.scatter_update(sparse_delta=sparse_delta))
-
-                # Increment episodes counter
-                operations.append(self.episodes.assign_add(delta=one, read_value=False))
+                operations.append(tf.raw_ops.ResourceScatterUpdate(
+                    resource=previous.handle, indices=parallel, updates=internals
+                ))
 
-                return tf.group(*operations)
+            # Episode reward summaries (before episode reward reset / episodes increment)
+            if self.summary_labels == 'all' or 'reward' in self.summary_labels:
+                with self.summarizer.as_default(), tf.summary.record_if(condition=is_terminal):
+                    x = tf.gather(params=self.episode_reward, indices=parallel)
+                    tf.summary.scalar(name='episode-reward', data=x, step=self.episodes)
+
+            # Reset episode reward
+            zero_float = tf_util.zeros(shape=(1,), dtype='float')
+            episode_reward = tf.where(
+                condition=is_terminal, x=zero_float,
+                y=tf.gather_nd(params=self.episode_reward, indices=index)
+            )
+            episode_reward = tf.tensor_scatter_nd_update(
+                tensor=self.episode_reward, indices=index, updates=episode_reward
+            )
+            operations.append(self.episode_reward.assign(value=episode_reward, read_value=False))
 
-            handle_terminal = tf.cond(pred=is_terminal, true_fn=fn_terminal, false_fn=tf.no_op)
+            # Increment episodes counter
+            delta = tf_util.cast(x=is_terminal, dtype='int')
+            operations.append(self.episodes.assign_add(delta=delta, read_value=False))
 
-        with tf.control_dependencies(control_inputs=(handle_terminal,)):
+        with tf.control_dependencies(control_inputs=operations):
             episodes = tf_util.identity(input=self.episodes)
             updates = tf_util.identity(input=self.updates)
             return updated, episodes, updates
@@ -690,15 +1060,47 @@ class Model(Module):
         #                     hint='not in {audio,histogram,image,scalar}'
         #                 )
 
-    def save(self, *, directory=None, filename=None, format='checkpoint', append=None):
+    def save(
+        self, *, directory=None, filename=None, format='checkpoint', append=None,
+        asynchronous=False, compression=None, dtype=None
+    ):
+        # Previous asynchronous save has to finish before the next one
+        self.wait_for_save()
+
+        if dtype is not None and format not in ('numpy', 'hdf5', 'raw'):
+            raise TensorforceError.value(
+                name='Model.save', argument='dtype', value=dtype,
+                condition='format is not "numpy", "hdf5" or "raw"'
+            )
+        elif dtype not in (None, 'float16'):
+            raise TensorforceError.value(
+                name='Model.save', argument='dtype', value=dtype, hint='not in {float16}'
+            )
+
+        if compression is not None and format != 'hdf5':
+            raise TensorforceError.value(
+                name='Model.save', argument='compression', value=compression,
+                condition='format is not "hdf5"'
+            )
+        elif compression not in (None, 'gzip', 'lzf'):
+            raise TensorforceError.value(
+                name='Model.save', argument='compression', value=compression,
+                hint='not in {gzip,lzf}'
+            )
+
         if directory is None and filename is None and format == 'checkpoint':
             if self.saver is None:
                 raise TensorforceError.required(name='Model.save', argument='directory')
-            if append is None:
-                append = self.saver._step_counter
-            else:
-                append = self.units[append]
-            return self.saver.save(checkpoint_number=append)
+            # Interval check instead of CheckpointManager, so the step counter is read once per
+            # call, and an append unit only on calls which actually write a checkpoint
+            step = self.saver._step_counter.numpy().item()
+            if self.saver_last_step is not None and \
+                    self.saver_last_step <= step < self.saver_last_step + self.saver_frequency:
+                return None
+            self.saver_last_step = step
+            if append is not None:
+                step = self.units[append].numpy().item()
+            return self.saver.save(checkpoint_number=step, check_interval=False)
 
         if directory is None:
             raise TensorforceError.required(name='Model.save', argument='directory')
@@ -712,8 +1114,10 @@ class Model(Module):
         if append is not None:
             filename = filename + '-' + str(append_value)
 
+        path = os.path.join(directory, filename)
+
         if format == 'saved-model':
-            directory = os.path.join(directory, filename)
+            directory = path
             assert hasattr(self, '_independent_act_graphs')
             assert len(self._independent_act_graphs) == 1
             independent_act = next(iter(self._independent_act_graphs.values()))
@@ -724,13 +1128,20 @@ class Model(Module):
             # always write temporary terminal=2/3 to indicate it is in process... has been removed recently...
             # check everywhere temrinal is checked that this is correct, if 3 is used.
             # Reset should reset estimator!!!
+            # Checkpoint object is created once and reused (also by restore and the saver), but
+            # explicit saves do not go through a CheckpointManager, since max_to_keep would then
+            # delete user-named checkpoints
             if self.checkpoint is None:
                 self.checkpoint = tf.train.Checkpoint(**{self.name: self})
 
             # We are using the high-level "save" method of the checkpoint to write a "checkpoint" file.
             # This makes it easily restorable later on.
             # The base class uses the lower level "write" method, which doesn't provide such niceties.
-            return self.checkpoint.save(file_prefix=os.path.join(directory, filename))
+            options = (async_checkpoint_options() if asynchronous else None)
+            if options is None:
+                return self.checkpoint.save(file_prefix=path)
+            self.pending_checkpoint = True
+            return self.checkpoint.save(file_prefix=path, options=options)
 
         # elif format == 'tensorflow':
         #     if self.summarizer_spec is not None:
@@ -767,26 +1178,39 @@ class Model(Module):
         #         assert graph_path == path + '.pb'
         #     return path
 
-        elif format == 'numpy':
-            variables = dict()
-            for variable in self.saved_variables:
-                variables[variable.name[len(self.name) + 1: -2]] = variable.numpy()
-            path = os.path.join(directory, filename) + '.npz'
-            np.savez(file=path, **variables)
-            return path
-
-        elif format == 'hdf5':
-            path = os.path.join(directory, filename) + '.hdf5'
-            with h5py.File(name=path, mode='w') as filehandle:
-                for variable in self.saved_variables:
-                    name = variable.name[len(self.name) + 1: -2]
-                    filehandle.create_dataset(name=name, data=variable.numpy())
+        elif format == 'numpy' or format == 'hdf5' or format == 'raw':
+            # Consistent snapshot of variable values, taken before the (asynchronous) write
+            # (np.asarray shares the host buffer of the read value, whereas .numpy() copies it)
+            variables = OrderedDict()
+            for name, variable in self.named_saved_variables().items():
+                value = variable.read_value()
+                # Downcast on device, so less data is copied to host, restore casts back
+                if dtype is not None and value.dtype.is_floating:
+                    value = tf.cast(x=value, dtype=tf.float16)
+                variables[name] = np.asarray(value)
+            if format == 'numpy':
+                path = path + '.npz'
+            elif format == 'raw':
+                path = path + '.bin'
+            else:
+                path = path + '.hdf5'
+            if asynchronous:
+                if self.save_executor is None:
+                    self.save_executor = ThreadPoolExecutor(max_workers=1)
+                self.pending_save = self.save_executor.submit(
+                    write_variables, path=path, variables=variables, compression=compression
+                )
+            else:
+                write_variables(path=path, variables=variables, compression=compression)
             return path
 
         else:
             raise TensorforceError.value(name='Model.save', argument='format', value=format)
 
     def restore(self, *, directory=None, filename=None, format='checkpoint'):
+        # Pending asynchronous save has to finish before its file is read
+        self.wait_for_save()
+
         if format == 'checkpoint':
             if directory is None:
                 if self.saver is None:
@@ -814,9 +1238,9 @@ class Model(Module):
                 raise TensorforceError(
                     name='Model.load', argument='filename', condition='format is "numpy"'
                 )
-            variables = np.load(file=(os.path.join(directory, filename) + '.npz'))
-            for variable in self.saved_variables:
-                variable.assign(value=variables[variable.name[len(self.name) + 1: -2]])
+            path = os.path.join(directory, filename) + '.npz'
+            variables = load_variables(path=path, names=tuple(self.named_saved_variables()))
+            self.assign_saved_variables(values=variables)
 
         elif format == 'hdf5':
             if directory is None:
@@ -827,14 +1251,27 @@ class Model(Module):
                 raise TensorforceError(
                     name='Model.load', argument='filename', condition='format is "hdf5"'
                 )
+            # Extension probing and cache key share one stat call
             path = os.path.join(directory, filename)
-            if os.path.isfile(path + '.hdf5'):
-                path = path + '.hdf5'
-            else:
-                path = path + '.h5'
-            with h5py.File(name=path, mode='r') as filehandle:
-                for variable in self.saved_variables:
-                    variable.assign(value=filehandle[variable.name[len(self.name) + 1: -2]])
+            names = tuple(self.named_saved_variables())
+            try:
+                variables = load_variables(path=(path + '.hdf5'), names=names)
+            except FileNotFoundError:
+                variables = load_variables(path=(path + '.h5'), names=names)
+            self.assign_saved_variables(values=variables)
+
+        elif format == 'raw':
+            if directory is None:
+                raise TensorforceError(
+                    name='Model.load', argument='directory', condition='format is "raw"'
+                )
+            if filename is None:
+                raise TensorforceError(
+                    name='Model.load', argument='filename', condition='format is "raw"'
+                )
+            path = os.path.join(directory, filename) + '.bin'
+            variables = load_variables(path=path, names=tuple(self.named_saved_variables()))
+            self.assign_saved_variables(values=variables)
 
         else:
             raise TensorforceError.value(name='Model.load', argument='format', value=format)
@@ -560,7 +560,9 @@ class TensorforceModel(Model):
     def initialize_api(self):
         super().initialize_api()
 
-        if self.summary_labels == 'all' or 'graph' in self.summary_labels:
+        do_graph_trace = (self.summary_labels == 'all' or 'graph' in self.summary_labels)
+
+        if do_graph_trace:
             tf.summary.trace_on(graph=True, profiler=False)
         self.experience(
             states=self.states_spec.empty(batched=True),
@@ -570,7 +572,7 @@ class TensorforceModel(Model):
             terminal=self.terminal_spec.empty(batched=True),
             reward=self.reward_spec.empty(batched=True)
         )
-        if self.summary_labels == 'all' or 'graph' in self.summary_labels:
+        if do_graph_trace:
             tf.summary.trace_export(name='experience', step=self.timesteps, profiler_outdir=None)
         # TODO: Not possible as it tries to retrieve experiences from memory
         # self.update()
@@ -1034,23 +1036,23 @@ class TensorforceModel(Model):
             indices = tf.stack(values=(parallel, buffer_index), axis=1)
             for name, buffer, state in self.states_buffer.zip_items(states):
                 value = tf.tensor_scatter_nd_update(tensor=buffer, indices=indices, updates=state)
-                assignments.append(buffer.assign(value=value))
+                assignments.append(buffer.assign(value=value, read_value=False))
                 # assignments.append(buffer.scatter_nd_update(indices=indices, updates=state))
             for name, buffer, internal in self.internals_buffer.zip_items(internals):  # not next_*
                 value = tf.tensor_scatter_nd_update(
                     tensor=buffer, indices=indices, updates=internal
                 )
-                assignments.append(buffer.assign(value=value))
+                assignments.append(buffer.assign(value=value, read_value=False))
                 # assignments.append(buffer.scatter_nd_update(indices=indices, updates=internal))
             for name, buffer, auxiliary in self.auxiliaries_buffer.zip_items(auxiliaries):
                 value = tf.tensor_scatter_nd_update(
                     tensor=buffer, indices=indices, updates=auxiliary
                 )
-                assignments.append(buffer.assign(value=value))
+                assignments.append(buffer.assign(value=value, read_value=False))
                 # assignments.append(buffer.scatter_nd_update(indices=indices, updates=auxiliary))
             for name, buffer, action in self.actions_buffer.zip_items(actions):
                 value = tf.tensor_scatter_nd_update(tensor=buffer, indices=indices, updates=action)
-                assignments.append(buffer.assign(value=value))
+                assignments.append(buffer.assign(value=value, read_value=False))
                 # assignments.append(buffer.scatter_nd_update(indices=indices, updates=action))
 
             # Increment buffer index (after buffer assignments)
@@ -1148,14 +1150,14 @@ class TensorforceModel(Model):
                 value = tf.tensor_scatter_nd_update(
                     tensor=self.terminal_buffer, indices=indices, updates=terminal
                 )
-                assignments.append(self.terminal_buffer.assign(value=value))
+                assignments.append(self.terminal_buffer.assign(value=value, read_value=False))
                 # assignments.append(
                 #     self.terminal_buffer.scatter_nd_update(indices=indices, updates=terminal)
                 # )
                 value = tf.tensor_scatter_nd_update(
                     tensor=self.reward_buffer, indices=indices, updates=reward
                 )
-                assignments.append(self.reward_buffer.assign(value=value))
+                assignments.append(self.reward_buffer.assign(value=value, read_value=False))
                 # assignments.append(
                 #     self.reward_buffer.scatter_nd_update(indices=indices, updates=reward)
                 # )
@@ -1292,14 +1294,14 @@ class TensorforceModel(Model):
                 value = tf.tensor_scatter_nd_update(
                     tensor=self.terminal_buffer, indices=indices, updates=terminal
                 )
-                assignments.append(self.terminal_buffer.assign(value=value))
+                assignments.append(self.terminal_buffer.assign(value=value, read_value=False))
                 # assignments.append(
                 #     self.terminal_buffer.scatter_nd_update(indices=indices, updates=terminal)
                 # )
                 value = tf.tensor_scatter_nd_update(
                     tensor=self.reward_buffer, indices=indices, updates=reward
                 )
-                assignments.append(self.reward_buffer.assign(value=value))
+                assignments.append(self.reward_buffer.assign(value=value, read_value=False))
                 # assignments.append(
                 #     self.reward_buffer.scatter_nd_update(indices=indices, updates=reward)
                 # )
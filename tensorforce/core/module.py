@@ -43,7 +43,7 @@ def make_key(*, x):
             raise exc
 
 
-def tf_function(*, num_args, optional=0):
+def tf_function(*, num_args, optional=0, jit_compile=False):
 
     def decorator(function):
 
@@ -82,8 +82,11 @@ def tf_function(*, num_args, optional=0):
             graph_params = tuple(
                 make_key(x=arg) for key, arg in kwargs.items() if key not in graph_signature
             )
+            graph_key = str(graph_params)
 
-            if str(graph_params) not in function_graphs:
+            # Retrace only for new graph parameters, since the input signature with unspecified
+            # batch dimension already covers all batch sizes
+            if graph_key not in function_graphs:
                 # # Check that length of graph specs are consistent
                 # assert len(function_graphs) == 0 or \
                 #     len(next(iter(function_graphs))) == len(graph_params)
@@ -101,14 +104,21 @@ def tf_function(*, num_args, optional=0):
                         results = function(self, **kwargs, **params_kwargs)
                     return results
 
-                function_graphs[str(graph_params)] = tf.function(
-                    func=function_graph, input_signature=graph_signature.to_list(), autograph=False
+                # XLA compilation, optionally deferred to agent config
+                if jit_compile == 'config':
+                    use_xla = self.config.jit_compile
+                else:
+                    use_xla = jit_compile
+
+                function_graphs[graph_key] = tf.function(
+                    func=function_graph, input_signature=graph_signature.to_list(), autograph=False,
+                    experimental_compile=(True if use_xla else None)
                     # experimental_implements=None, experimental_autograph_options=None,
-                    # experimental_relax_shapes=False, experimental_compile=None
+                    # experimental_relax_shapes=False
                 )
 
             # Apply function graph
-            return function_graphs[str(graph_params)](*graph_args)
+            return function_graphs[graph_key](*graph_args)
 
         return decorated
 
@@ -456,7 +466,8 @@ class Module(tf.Module):
         return module
 
     def variable(
-        self, *, name, spec, initializer, is_trainable, is_saved, initialization_scale=None
+        self, *, name, spec, initializer, is_trainable, is_saved, initialization_scale=None,
+        synchronization=tf.VariableSynchronization.AUTO, aggregation=tf.VariableAggregation.NONE
     ):
         assert self.is_initialized is False
         # name
@@ -578,7 +589,8 @@ class Module(tf.Module):
         # Variable
         variable = tf.Variable(
             initial_value=initializer, trainable=is_trainable, validate_shape=True, name=name,
-            dtype=spec.tf_type(), shape=spec.shape
+            dtype=spec.tf_type(), shape=spec.shape, synchronization=synchronization,
+            aggregation=aggregation
         )
         variable.is_saved = is_saved
 
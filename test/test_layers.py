@@ -15,6 +15,10 @@
 
 import unittest
 
+import numpy as np
+import tensorflow as tf
+
+from tensorforce.core.layers import ExponentialNormalization
 from test.unittest_base import UnittestBase
 
 
@@ -128,6 +132,33 @@ class TestLayers(UnittestBase, unittest.TestCase):
         ]
         self.unittest(states=states, policy=network)
 
+    def test_normalization_fused(self):
+        self.start_tests(name='normalization-fused')
+
+        # Fused (all but last axis) and non-fused exponential normalization agree, in particular
+        # for small variance where epsilon matters
+        states = dict(type='float', shape=(2, 3), min_value=1.0, max_value=2.0)
+        network = [dict(type='exponential_normalization'), dict(type='flatten')]
+        x = tf.constant(value=np.random.random_sample(size=(4, 2, 3)), dtype=tf.float32)
+        outputs = list()
+        for is_channels_last in (True, False):
+            agent, environment = self.prepare(states=states, policy=dict(network=network))
+            layer = next(
+                layer for layer in agent.model.policy.network.layers
+                if isinstance(layer, ExponentialNormalization)
+            )
+            self.assertTrue(layer.is_channels_last)
+            layer.is_channels_last = is_channels_last
+            layer._apply_graphs.clear()
+            layer.moving_mean.assign(value=np.full(shape=(1, 1, 3), fill_value=0.5))
+            layer.moving_variance.assign(value=np.asarray([[[0.0, 1e-6, 1.0]]]))
+            outputs.append(layer.apply(x=x, independent=True).numpy())
+            agent.close()
+            environment.close()
+        self.assertTrue(np.allclose(outputs[0], outputs[1], rtol=1e-4, atol=1e-4))
+
+        self.finished_test()
+
     def test_pooling(self):
         self.start_tests(name='pooling')
 
@@ -244,6 +244,197 @@ class TestSaving(UnittestBase, unittest.TestCase):
 
         self.finished_test()
 
+    def test_saved_model_rnn(self):
+        self.start_tests(name='saved-model-rnn')
+
+        with TemporaryDirectory() as directory:
+            # default unittest policy with RNN internals
+            agent, environment = self.prepare(
+                config=dict(eager_mode=False, create_debug_assertions=True)
+            )
+            agent.save(directory=directory, format='saved-model')
+            agent.close()
+            environment.close()
+
+            # SavedModel signature outputs have to be flat
+            import tensorflow as tf
+            agent = tf.saved_model.load(export_dir=os.path.join(directory, 'agent'))
+            outputs = agent.signatures['serving_default'].structured_outputs
+            self.assertTrue(all(isinstance(value, tf.Tensor) for value in outputs.values()))
+            self.assertTrue(all(
+                name.startswith('actions/') or name.startswith('internals/') for name in outputs
+            ))
+            self.assertTrue(any(name.startswith('internals/') for name in outputs))
+
+        self.finished_test()
+
+    def test_formats(self):
+        self.start_tests(name='formats')
+
+        with TemporaryDirectory() as directory:
+            policy = dict(network=dict(type='auto', size=8, depth=1, rnn=False))
+            agent, environment = self.prepare(
+                policy=policy, config=dict(eager_mode=False, create_debug_assertions=True)
+            )
+            states = environment.reset()
+            actions = agent.act(states=states)
+            states, terminal, reward = environment.execute(actions=actions)
+            agent.observe(terminal=terminal, reward=reward)
+            weights0 = agent.model.policy.network.layers[1].weights.numpy()
+
+            # save: raw format
+            path = agent.save(directory=directory, filename='raw', format='raw')
+            self.assertEqual(path, os.path.join(directory, 'raw.bin'))
+            self.assertTrue(os.path.isfile(os.path.join(directory, 'raw.idx.json')))
+            self.finished_test()
+
+            # save: numpy format, asynchronous, small variables packed
+            agent.save(directory=directory, filename='numpy', format='numpy', asynchronous=True)
+            agent.model.wait_for_save()
+            with np.load(file=os.path.join(directory, 'numpy.npz')) as filehandle:
+                self.assertIn('__packed_float32', filehandle.files)
+            self.finished_test()
+
+            # save: checkpoint format, asynchronous (synchronous if unsupported)
+            agent.save(
+                directory=directory, filename='agent', format='checkpoint', asynchronous=True
+            )
+            self.finished_test()
+
+            # save: hdf5 format, compression
+            for compression in ('gzip', 'lzf'):
+                agent.save(
+                    directory=directory, filename=compression, format='hdf5',
+                    compression=compression
+                )
+            self.finished_test()
+
+            # save: numpy format, float16
+            agent.save(directory=directory, filename='float16', format='numpy', dtype='float16')
+            with np.load(file=os.path.join(directory, 'float16.npz')) as filehandle:
+                self.assertIn('__packed_float16', filehandle.files)
+                self.assertTrue(
+                    all(filehandle[name].dtype != np.float32 for name in filehandle.files)
+                )
+            self.finished_test()
+
+            agent.close()
+
+            # load: all formats (raw/hdf5 format implicit)
+            for filename, format in (
+                ('raw', None), ('numpy', 'numpy'), ('agent', 'checkpoint'), ('gzip', None),
+                ('lzf', None), ('float16', 'numpy')
+            ):
+                agent = Agent.load(
+                    directory=directory, filename=filename, format=format, environment=environment
+                )
+                x = agent.model.policy.network.layers[1].weights.numpy()
+                if filename == 'float16':
+                    self.assertTrue(np.allclose(x, weights0, rtol=1e-3, atol=1e-3))
+                else:
+                    self.assertTrue((x == weights0).all())
+                self.assertEqual(agent.timesteps, 1)
+                agent.close()
+                self.finished_test()
+
+            environment.close()
+
+        self.finished_test()
+
+    def test_jit_compile(self):
+        self.start_tests(name='jit-compile')
+
+        # act/observe with XLA-compiled API functions
+        agent, environment = self.prepare(
+            policy=dict(network=dict(type='auto', size=8, depth=1, rnn=False)),
+            config=dict(eager_mode=False, create_tf_assertions=False, jit_compile=True)
+        )
+        states = environment.reset()
+        terminal = False
+        while not terminal:
+            actions = agent.act(states=states)
+            states, terminal, reward = environment.execute(actions=actions)
+            agent.observe(terminal=terminal, reward=reward)
+        self.assertEqual(agent.episodes, 1)
+        agent.close()
+        environment.close()
+
+        self.finished_test()
+
+    def test_variables(self):
+        self.start_tests(name='variables')
+
+        with TemporaryDirectory() as directory:
+            agent, environment = self.prepare(
+                config=dict(eager_mode=False, create_debug_assertions=True)
+            )
+            num_saved = len(agent.model.saved_variables)
+            num_trainable = len(agent.model.trainable_variables)
+
+            # save/restore caches must not add variable references to the model
+            agent.save(directory=directory, format='numpy')
+            agent.restore(directory=directory, filename='agent', format='numpy')
+            self.assertEqual(len(agent.model.saved_variables), num_saved)
+            self.assertEqual(len(agent.model.trainable_variables), num_trainable)
+
+            agent.close()
+            environment.close()
+
+        self.finished_test()
+
+    def test_hdf5(self):
+        self.start_tests(name='hdf5')
+
+        from tensorforce.core.models.model import load_variables, write_variables
+
+        # load: legacy file, one dataset per variable in nested groups
+        with np.load(file='test/data/ppo-checkpoint.npz') as filehandle:
+            expected = {name: filehandle[name] for name in filehandle.files}
+        path = 'test/data/ppo-checkpoint.hdf5'
+        variables = load_variables(path=path, names=tuple(expected))
+        for name, value in expected.items():
+            self.assertTrue((variables[name] == value).all())
+        self.finished_test()
+
+        # save/load: large (unpacked) variable with nested name, plus small (packed) variables
+        expected = dict(
+            weights=np.random.random_sample(size=(200, 100)).astype(np.float32),
+            bias=np.random.random_sample(size=(100,)).astype(np.float32),
+            timesteps=np.asarray(3, dtype=np.int64)
+        )
+        expected = {'policy/' + name: value for name, value in expected.items()}
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'agent.hdf5')
+            write_variables(path=path, variables=expected)
+            variables = load_variables(path=path, names=tuple(expected))
+            for name, value in expected.items():
+                self.assertEqual(variables[name].dtype, value.dtype)
+                self.assertEqual(variables[name].shape, value.shape)
+                self.assertTrue((variables[name] == value).all())
+        self.finished_test()
+
+    def test_zero_size(self):
+        self.start_tests(name='zero-size')
+
+        from tensorforce.core.models.model import load_variables, write_variables
+
+        # save/load: zero-size variable in between other variables, for all file formats
+        expected = dict(
+            weights=np.random.random_sample(size=(200, 100)).astype(np.float32),
+            empty=np.zeros(shape=(0, 4), dtype=np.float32),
+            timesteps=np.asarray(3, dtype=np.int64)
+        )
+        with TemporaryDirectory() as directory:
+            for extension in ('.npz', '.hdf5', '.bin'):
+                path = os.path.join(directory, 'agent' + extension)
+                write_variables(path=path, variables=expected)
+                variables = load_variables(path=path, names=tuple(expected))
+                for name, value in expected.items():
+                    self.assertEqual(variables[name].dtype, value.dtype)
+                    self.assertEqual(variables[name].shape, value.shape)
+                    self.assertTrue((variables[name] == value).all())
+        self.finished_test()
+
     def test_config(self):
         # FEATURES.MD
         self.start_tests(name='config')
@@ -17,6 +17,8 @@ import os
 from tempfile import TemporaryDirectory
 import unittest
 
+import tensorflow as tf
+
 from test.unittest_base import UnittestBase
 
 
@@ -65,3 +67,41 @@ class TestSummaries(UnittestBase, unittest.TestCase):
             self.assertTrue(files[0].startswith('events.out.tfevents.'))
 
         self.finished_test()
+
+    def test_frequency(self):
+        self.start_tests(name='frequency')
+
+        with TemporaryDirectory() as directory:
+            agent, environment = self.prepare(
+                config=dict(create_tf_assertions=False, eager_mode=False),
+                summarizer=dict(directory=directory, labels=['reward'], frequency=2)
+            )
+
+            states = environment.reset()
+            terminal = False
+            timesteps = 0
+            while not terminal:
+                actions = agent.act(states=states)
+                states, terminal, reward = environment.execute(actions=actions)
+                agent.observe(terminal=terminal, reward=reward)
+                timesteps += 1
+
+            agent.close()
+            environment.close()
+
+            directories = os.listdir(path=directory)
+            self.assertEqual(len(directories), 1)
+            files = os.listdir(path=os.path.join(directory, directories[0]))
+            self.assertEqual(len(files), 1)
+            self.assertTrue(files[0].startswith('events.out.tfevents.'))
+
+            # Timestep reward summary only recorded every second timestep (ignoring step 0 of the
+            # empty-batch call when initializing the agent)
+            path = os.path.join(directory, directories[0], files[0])
+            steps = [
+                event.step for event in tf.compat.v1.train.summary_iterator(path)
+                for value in event.summary.value if value.tag == 'reward' and event.step > 0
+            ]
+            self.assertEqual(steps, list(range(2, timesteps + 1, 2)))
+
+        self.finished_test()